@@ -1,25 +1,58 @@
-import time
-import re
-from wordcloud import WordCloud, STOPWORDS
-import matplotlib.pyplot as plt
+import argparse
+import threading
 
 from interfaces import WordListRequestConfig, DataInterfaceManager
 from config import API_KEYS
 
 dim = DataInterfaceManager(API_KEYS)
-STOPWORDS |= {'RT'}
+
+# One WordCloud instance shared across renders so the FreeType font parsing and layout setup are
+# paid once per process instead of per request. WordCloud keeps mutable layout state on itself,
+# so renders are serialized with a lock.
+_wordcloud = None
+_wordcloud_lock = threading.Lock()
+
+
+def render_wordcloud(word_counts, output_path=None):
+    """Renders a word frequency Counter into the shared WordCloud instance and returns it.
+    If output_path is given, the rendered image is also saved there."""
+    global _wordcloud
+    with _wordcloud_lock:
+        if _wordcloud is None:
+            from wordcloud import WordCloud  # Deferred so CLI startup/--help isn't gated on it
+            # collocations=False skips the bigram-scoring pass, normalize_plurals=False skips the
+            # per-word endswith('s') re-count, and capping max_words bounds the layout work
+            _wordcloud = WordCloud(width=800, height=800,
+                                   background_color='white',
+                                   min_font_size=10,
+                                   max_words=150,
+                                   collocations=False,
+                                   normalize_plurals=False)
+        _wordcloud.generate_from_frequencies(word_counts)
+        if output_path:
+            _wordcloud.to_image().save(output_path, optimize=True)
+        return _wordcloud
 
 
 if __name__ == '__main__':
-    word_list = dim.request_word_list(WordListRequestConfig('twitter', 'hashtag', 'impeachmentinquiry', 1000, None, 'top', None))
-    word_list = filter(lambda x: not re.search(r'^https|^@|^#', x), word_list)
-    word_string = ' '.join(word_list)
-    wordcloud = WordCloud(width=800, height=800,
-                          background_color='white',
-                          stopwords=set(STOPWORDS),
-                          min_font_size=10).generate(word_string)
-    plt.figure(figsize=(8, 8), facecolor=None)
-    plt.imshow(wordcloud)
-    plt.axis("off")
-    plt.tight_layout(pad=0)
-    plt.show()
+    parser = argparse.ArgumentParser(description='Generate a word cloud from social media posts')
+    parser.add_argument('--interactive', action='store_true',
+                        help='display the cloud in a matplotlib window instead of saving a PNG')
+    parser.add_argument('--output', default='wordcloud.png',
+                        help='path of the saved image when not running interactively')
+    args = parser.parse_args()
+
+    # Interfaces return ready-made word frequency Counters, already lowercased and stopword-filtered,
+    # so the cloud is generated straight from frequencies with no second tokenization pass
+    word_counts = dim.request_word_list(WordListRequestConfig('twitter', 'hashtag', 'impeachmentinquiry', 1000, sort='top'))
+    if args.interactive:
+        wordcloud = render_wordcloud(word_counts)
+        # pyplot costs ~800ms of import time and tens of MB; only pay for it when displaying
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(8, 8), facecolor=None)
+        plt.imshow(wordcloud)
+        plt.axis("off")
+        plt.tight_layout(pad=0)
+        plt.show()
+    else:
+        render_wordcloud(word_counts, output_path=args.output)
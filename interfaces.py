@@ -1,18 +1,78 @@
-from typing import NamedTuple, Tuple
+import functools
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from sys import intern
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
 from datetime import datetime
 
-import praw
-import tweepy
+from wordcloud import STOPWORDS
 
+# praw, tweepy, pmaw and requests_cache are imported inside the interfaces that use them, so a
+# platform that isn't configured never pays its import cost at startup.
 
-class WordListRequestConfig(NamedTuple):
+# URLs are removed wholesale before tokenization; _TOKEN's lookbehind alone can't stop domain and
+# path fragments ('example', 'com', ...) from matching inside a link.
+_URL = re.compile(r"(?:https?://|www\.)\S+")
+
+# Single compiled tokenizer: pulls out word-like tokens while skipping @mentions, #hashtags and
+# stray URL scheme fragments, so callers don't need a separate split + per-token filter pass.
+# The third-party regex engine is preferred when available: it matches faster than stdlib re on
+# Unicode-heavy text and its \p{L} classes cover accented and non-Latin words that [a-zA-Z]
+# would split apart.
+try:
+    import regex
+    _TOKEN = regex.compile(r"(?<![@#\w])(?!https?\b)[\p{L}][\p{L}\p{M}']{2,}")
+except ImportError:
+    _TOKEN = re.compile(r"(?<![@#\w])(?!https?\b)[a-zA-Z][a-zA-Z']{2,}")
+
+# Lowercased stopword set, frozen once at import time. Tokens are filtered against it during
+# extraction so WordCloud receives a pre-filtered frequency dict and needs no stopwords pass.
+_STOP = frozenset(w.lower() for w in STOPWORDS | {'rt'})
+
+
+def _tokenize(text):
+    """Yields lowercased, interned word tokens from text, skipping stopwords. Interning dedupes
+    the many repeats of common words in a large corpus and makes the Counter's key comparisons a
+    pointer check."""
+    return (intern(t) for t in map(str.lower, _TOKEN.findall(_URL.sub(' ', text))) if t not in _STOP)
+
+
+# Maps platform names to their DataInterface subclass, populated by the register decorator below.
+# A single dict lookup replaces the class-name string construction + globals() probe that
+# autopopulate used to do per platform.
+_INTERFACE_REGISTRY = {}
+
+# Platforms whose interfaces need no API keys; autopopulate creates these even when the
+# api_key_dict has no entry for them
+_KEYLESS_PLATFORMS = set()
+
+
+def register(platform, requires_keys=True):
+    """Class decorator that records a DataInterface subclass in _INTERFACE_REGISTRY under the
+    given platform name, making it discoverable by DataInterfaceManager.autopopulate. Pass
+    requires_keys=False for interfaces that work without credentials."""
+    def decorator(interface_class):
+        _INTERFACE_REGISTRY[platform] = interface_class
+        if not requires_keys:
+            _KEYLESS_PLATFORMS.add(platform)
+        return interface_class
+    return decorator
+
+
+@dataclass(frozen=True)
+class WordListRequestConfig:
     platform: str  # reddit vs. Twitter
     source_type: str  # user, hashtag, subreddit, etc.
     source_value: str  # the actual source e.g. 'r/python'
     max_posts: int
-    time: Tuple[datetime, datetime]  # time[0] = min time, time[1] max time
-    sort: str
-    extra_args: dict = {}  # A dictionary of extra arguments/values
+    time: Optional[Tuple[datetime, datetime]] = None  # time[0] = min time, time[1] max time
+    sort: Optional[str] = None
+    extra_args: dict = field(default_factory=dict)  # A dictionary of extra arguments/values
 
 
 class DataInterfaceManager:
@@ -32,14 +92,26 @@ class DataInterfaceManager:
     def autopopulate(self, exclude_list):
         """Automatically populates the self.interfaces dict from self.api_key_dict with valid interfaces"""
         for platform, api_keys in self.api_key_dict.items():
-            expected_class_name = f'{platform.capitalize()}Interface'
-            if expected_class_name not in globals() or (exclude_list and platform not in exclude_list):
-                print('f')
+            if platform in (exclude_list or ()):
+                continue
+            interface_class = _INTERFACE_REGISTRY.get(platform)
+            if interface_class is None:
                 continue
-            interface_class = globals()[expected_class_name]
             self.interfaces[platform] = interface_class(api_keys)
+        for platform in _KEYLESS_PLATFORMS:
+            if platform in self.interfaces or platform in (exclude_list or ()):
+                continue
+            self.interfaces[platform] = _INTERFACE_REGISTRY[platform]()
 
     def request_word_list(self, request_config: WordListRequestConfig):
+        pushshift = self.interfaces.get('pushshift')
+        if (request_config.platform == 'reddit' and request_config.time is not None
+                and pushshift is not None
+                and request_config.source_type in pushshift.valid_source_types):
+            # Time-bounded historical pulls go through Pushshift, which filters server-side and
+            # isn't subject to the live reddit API's ~1000 item listing cap. Source types Pushshift
+            # can't serve (e.g. 'post') stay on the live reddit interface.
+            request_config = replace(request_config, platform='pushshift')
         if request_config.platform not in self.platforms:
             return None  # Maybe this should raise an error? e.g. APINotImplenetedError
         return self.interfaces[request_config.platform].get_word_list(request_config)
@@ -47,9 +119,8 @@ class DataInterfaceManager:
 
 class DataInterface:
     """Super class for all data interfaces. Initializes api client and handles getting word lists from valid sources.
-    All child classes should adhere to the following naming convention:
-        -The name of the class should be "PlatformInterface", where Platform is the name of the platform
-            with a capitalized first letter.
+    All child classes should adhere to the following conventions:
+        -The class should be decorated with @register('platform') so DataInterfaceManager can find it.
         -Functions that retrieve from sources should be named "from_source", where source is a string representation of
             what the source is called, and is also a member of the class' valid_sources list."""
 
@@ -60,6 +131,11 @@ class DataInterface:
         self.api_class = api_class
         self.api_keys = api_keys
         self.api = self.init_api_client()
+        # Source type -> bound from_* method, resolved once here instead of rebuilding the
+        # f'from_{...}' string and walking the descriptor protocol on every get_word_list call
+        self._dispatch = {source_type: getattr(self, f'from_{source_type}')
+                          for source_type in valid_source_types
+                          if hasattr(self, f'from_{source_type}')}
 
     def __repr__(self):
         return f'<{self.platform.upper()} INTERFACE: {self.api}>'
@@ -68,77 +144,184 @@ class DataInterface:
         return self.api_class(**self.api_keys)
 
     def get_word_list(self, request_config: WordListRequestConfig):
-        if request_config.platform != self.platform or request_config.source_type not in self.valid_source_types:
+        fetch_function = self._dispatch.get(request_config.source_type)
+        if request_config.platform != self.platform or fetch_function is None:
             raise Exception(f'Invalid request config; tried {request_config.platform, request_config.source_value}'
                             f'on {self.platform} which only accepts {self.valid_source_types}')
-        fetch_function = getattr(self, f'from_{request_config.source_type}')
         return fetch_function(request_config)
 
 
+class RateLimiter:
+    """Spaces out API calls made from multiple threads so concurrent fetches stay under the
+    platform's requests-per-second budget. Used as a context manager around each request."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_request_time = 0.0
+
+    def __enter__(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+@register('reddit')
 class RedditInterface(DataInterface):
+    max_fetch_workers = 8  # Threads used when expanding a post's comment tree
+    cache_expire_seconds = 600  # TTL for the on-disk HTTP response cache
+
     def __init__(self, api_keys):
+        import praw
         valid_source_types = ['subreddit', 'user', 'post']
         valid_sort_types = ['top', 'new', 'controversial']
+        self.rate_limiter = RateLimiter(requests_per_second=4)
         super().__init__(praw.Reddit, api_keys, 'reddit', valid_source_types, valid_sort_types)
 
+    def init_api_client(self):
+        # The cached session answers repeat scrapes of the same listings from disk during iterative
+        # runs; ratelimit_seconds lets PRAW sleep through rate limits itself based on the
+        # X-Ratelimit-* response headers instead of surfacing an exception
+        import requests_cache
+        session = requests_cache.CachedSession('reddit_cache', expire_after=self.cache_expire_seconds)
+        # check_for_updates=False drops PRAW's update-check HTTPS call at startup
+        return self.api_class(**self.api_keys, ratelimit_seconds=600, check_for_updates=False,
+                              timeout=30, requestor_kwargs={'session': session})
+
+    @functools.lru_cache(maxsize=1024)
+    def _redditor(self, name):
+        """Cached wrapper around api.redditor; PRAW re-fetches /user/{name}/about/ on lazy
+        attribute access, so repeat lookups of the same user would otherwise repeat round trips."""
+        return self.api.redditor(name)
+
     def from_subreddit(self, request_config: WordListRequestConfig):
-        subreddit = self.api.subreddit(request_config.source_value)
+        source = request_config.source_value
+        if not isinstance(source, str):
+            # reddit aggregates 'python+django+flask' style multireddits server-side, so a list of
+            # subreddit names costs one listing request instead of one per subreddit
+            source = '+'.join(source)
+        subreddit = self.api.subreddit(source)
         submissions_getter = getattr(subreddit, request_config.sort)
         submissions = submissions_getter(limit=request_config.max_posts)
-        words = []
-        for s in submissions:
-            words.extend(s.title.split())
-        return words
+        return Counter(chain.from_iterable(_tokenize(s.title) for s in submissions))
 
     def from_user(self, request_config: WordListRequestConfig):
-        user = self.api.redditor(request_config.source_value)
+        user = self._redditor(request_config.source_value)
         sorted_comments = getattr(user.comments, request_config.sort)
-        words = []
-        for c in sorted_comments(limit=request_config.max_posts):
-            words.extend(c.body.split())
-        return words
+        return Counter(chain.from_iterable(
+            _tokenize(c.body) for c in sorted_comments(limit=request_config.max_posts)))
 
     def from_post(self, request_config: WordListRequestConfig):
+        # The submission is deliberately not lru_cache'd: comment_sort/comment_limit only apply
+        # before the comment tree is fetched, so reusing a cached object would silently serve a
+        # previous call's sort and limit. Duplicate lookups are absorbed by the cached HTTP session.
         submission = self.api.submission(request_config.source_value)
         submission.comment_sort = request_config.sort
         submission.comment_limit = request_config.max_posts
         comments = submission.comments
         if not request_config.extra_args.get('top_level_only', False):  # If we're looking at all child comments too
-            comments.replace_more(limit=None)
-            comments = comments.list()
+            comments = self._expand_comment_tree(comments)
         else:
             comments.replace_more(limit=0)
-        words = []
-        for c in comments:
-            words.extend(c.body.split())
-        return words
+            comments = list(comments)
+        # The list is materialized above so any lazy loading happens before the extraction loop;
+        # only c.body is touched, since other attributes can trigger extra fetches per comment
+        return Counter(chain.from_iterable(_tokenize(c.body) for c in comments))
+
+    def _expand_comment_tree(self, comment_forest):
+        """Resolves a comment tree's MoreComments placeholders concurrently. Each placeholder is an
+        independent HTTP round trip, so fanning them out across a thread pool overlaps the network
+        latency that replace_more(limit=None) would otherwise pay serially."""
+        from praw.models import MoreComments
+        comments = []
+        pending_mores = []
+        for c in comment_forest.list():
+            if isinstance(c, MoreComments):
+                pending_mores.append(c)
+            else:
+                comments.append(c)
+        with ThreadPoolExecutor(max_workers=self.max_fetch_workers) as pool:
+            futures = [pool.submit(self._fetch_more_comments, more) for more in pending_mores]
+            while futures:
+                resubmitted = []
+                for future in as_completed(futures):
+                    for c in future.result():
+                        if isinstance(c, MoreComments):
+                            resubmitted.append(pool.submit(self._fetch_more_comments, c))
+                        else:
+                            comments.append(c)
+                futures = resubmitted
+        return comments
+
+    def _fetch_more_comments(self, more):
+        with self.rate_limiter:
+            return more.comments()
+
+
+@register('pushshift', requires_keys=False)
+class PushshiftInterface(DataInterface):
+    """Historical Reddit scrapes through the Pushshift archive via PMAW, which multithreads the
+    pagination and accepts server-side before/after timestamps. Live 'new'/'hot' listings should
+    still go through RedditInterface; the manager routes requests with a time range here."""
+
+    def __init__(self, api_keys=None):
+        from pmaw import PushshiftAPI
+        valid_source_types = ['subreddit', 'user']
+        valid_sort_types = []
+        super().__init__(PushshiftAPI, api_keys or {}, 'pushshift', valid_source_types, valid_sort_types)
+
+    def from_subreddit(self, request_config: WordListRequestConfig):
+        submissions = self.api.search_submissions(subreddit=request_config.source_value,
+                                                  after=int(request_config.time[0].timestamp()),
+                                                  before=int(request_config.time[1].timestamp()),
+                                                  limit=request_config.max_posts)
+        # PMAW yields plain dicts rather than PRAW models
+        return Counter(chain.from_iterable(_tokenize(s['title']) for s in submissions))
+
+    def from_user(self, request_config: WordListRequestConfig):
+        comments = self.api.search_comments(author=request_config.source_value,
+                                            after=int(request_config.time[0].timestamp()),
+                                            before=int(request_config.time[1].timestamp()),
+                                            limit=request_config.max_posts)
+        return Counter(chain.from_iterable(_tokenize(c['body']) for c in comments))
 
 
+@register('twitter')
 class TwitterInterface(DataInterface):
     def __init__(self, api_keys):
+        import tweepy
         valid_sources = ['user','hashtag']
         valid_sort_types = []
-        super().__init__(tweepy.API, api_keys, 'twitter', valid_sources, valid_sort_types)
+        super().__init__(tweepy.Client, api_keys, 'twitter', valid_sources, valid_sort_types)
 
     def init_api_client(self):
-        auth = tweepy.AppAuthHandler(**self.api_keys)
-        return tweepy.API(auth)
+        # The v2 Client authenticates with a single bearer token and sits on endpoints with
+        # higher rate-limit ceilings than the deprecated v1.1 search
+        return self.api_class(bearer_token=self.api_keys['bearer_token'])
 
     def from_user(self, request_config: WordListRequestConfig):
-        user_tweets = self.api.user_timeline(screen_name=request_config.source_value, count=request_config.max_posts)
-        words = []
-        for tweet in user_tweets:
-            words.extend(tweet.text.split())
-        return words
+        import tweepy
+        user = self.api.get_user(username=request_config.source_value)
+        tweets = tweepy.Paginator(self.api.get_users_tweets, user.data.id,
+                                  max_results=100).flatten(limit=request_config.max_posts)
+        return Counter(chain.from_iterable(_tokenize(tweet.text) for tweet in tweets))
 
     def from_hashtag(self, request_config: WordListRequestConfig):
-        tweets = tweepy.Cursor(self.api.search,
-                               q=f'#{request_config.source_value}',
-                               lang='en').items(request_config.max_posts)
-        words = []
-        for tweet in tweets:
-            words.extend(tweet.text.split())
-        return words
+        import tweepy
+        # Each search_recent_tweets round trip returns a full 100-tweet batch; Paginator.flatten
+        # stops requesting pages once max_posts tweets have been consumed
+        tweets = tweepy.Paginator(self.api.search_recent_tweets,
+                                  query=f'#{request_config.source_value} lang:en',
+                                  tweet_fields=['text'],
+                                  max_results=100).flatten(limit=request_config.max_posts)
+        return Counter(chain.from_iterable(_tokenize(tweet.text) for tweet in tweets))
 
 
 
@@ -149,4 +332,4 @@ if __name__ == '__main__':
     dim = DataInterfaceManager(API_KEYS)
     reddit = dim['reddit']
     twitter = dim['twitter']
-    print(dim.request_word_list(WordListRequestConfig('twitter', 'hashtag', 'impeachmentinquiry', 100, None, None, None)))
+    print(dim.request_word_list(WordListRequestConfig('twitter', 'hashtag', 'impeachmentinquiry', 100)))